@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries expire ``ttl`` seconds after they are stored."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        # Lookup counters for hit-rate logging, updated under the lock. Membership tests and peek() don't count.
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None, *, count_miss: bool = True) -> Any:
+        """Return the live value for ``key``; ``count_miss=False`` suits a probe that falls back to another cache."""
+
+        return self._lookup(key, default, count_hit=True, count_miss=count_miss)
+
+    def peek(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Like ``get`` but leaves the hit/miss counters alone."""
+
+        return self._lookup(key, default, count_hit=False, count_miss=False)
+
+    def _lookup(self, key: Hashable, default: Any, count_hit: bool, count_miss: bool) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += count_miss
+                return default
+            self._data.move_to_end(key)
+            self.hits += count_hit
+            return entry[1]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        sentinel = object()
+        return self.peek(key, sentinel) is not sentinel
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
@@ -5,60 +5,105 @@ from dataclasses import dataclass, field
 import logging
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from types import MappingProxyType
+from typing import Any, Callable, List, Mapping, TypeVar
 
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# Deployments that inject env vars directly (Railway) can skip the .env disk read + parse.
+if os.getenv("SKIP_DOTENV") != "1":
+    load_dotenv()
 
+DEFAULT_MICROCAP_ETFS = "IWM,IWC,SMLF,VTWO,URTY"
 
-@dataclass
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Central configuration object loaded from environment variables."""
 
-    alpaca_api_key: str = field(default_factory=lambda: os.getenv("ALPACA_API_KEY") or os.getenv("APCA_API_KEY_ID", ""))
-    alpaca_api_secret: str = field(
-        default_factory=lambda: os.getenv("ALPACA_API_SECRET") or os.getenv("APCA_API_SECRET_KEY", "")
-    )
-    alpaca_base_url: str = field(default_factory=lambda: os.getenv("ALPACA_API_BASE_URL", "https://paper-api.alpaca.markets"))
-    alpaca_data_url: str = field(default_factory=lambda: os.getenv("ALPACA_API_DATA_URL", "https://data.alpaca.markets/v2"))
-
-    twelvedata_api_key: str = field(default_factory=lambda: os.getenv("TWELVEDATA_API_KEY") or os.getenv("TWELVEDATA_KEY", ""))
-    alphavantage_api_key: str = field(
-        default_factory=lambda: os.getenv("ALPHAVANTAGE_API_KEY")
-        or os.getenv("ALPHAVANTAGE_KEY")
-        or os.getenv("ALPHA_VANTAGE_KEY", "")
-    )
-    openai_api_key: str = field(default_factory=lambda: os.getenv("OPENAI_API_KEY", ""))
-    use_sentiment: bool = field(default_factory=lambda: str(os.getenv("USE_SENTIMENT", "true")).lower() != "false")
-    use_finnhub: bool = field(default_factory=lambda: str(os.getenv("USE_FINNHUB", "false")).lower() == "true")
-    sentiment_cache_ttl: int = field(default_factory=lambda: int(os.getenv("SENTIMENT_CACHE_TTL", "300")))
-
-    universe_fallback_csv: Path = field(
-        default_factory=lambda: Path(os.getenv("UNIVERSE_FALLBACK_CSV", "universe/fallback_universe.csv"))
-    )
-    microcap_etfs: List[str] = field(
-        default_factory=lambda: [token.strip().upper() for token in os.getenv("MICROCAP_ETFS", "IWM,IWC,SMLF,VTWO,URTY").split(",") if token.strip()]
-    )
-
-    scheduler_interval_seconds: int = field(default_factory=lambda: int(os.getenv("SCHEDULER_INTERVAL_SECONDS", "900")))
-    max_positions: int = field(default_factory=lambda: int(os.getenv("MAX_POSITIONS", "10")))
-    portfolio_state_path: Path = field(default_factory=lambda: Path(os.getenv("PORTFOLIO_STATE_PATH", "data/portfolio_state.json")))
-    initial_equity: float = field(default_factory=lambda: float(os.getenv("INITIAL_EQUITY", "100000")))
-    max_daily_loss_pct: float = field(default_factory=lambda: float(os.getenv("MAX_DAILY_LOSS_PCT", "0.03")))
-    max_position_pct: float = field(default_factory=lambda: float(os.getenv("MAX_POSITION_PCT", "0.10")))
-    atr_multiplier: float = field(default_factory=lambda: float(os.getenv("ATR_MULTIPLIER", "2.5")))
-    min_confidence: float = field(default_factory=lambda: float(os.getenv("MIN_CONFIDENCE", "0.45")))
-    default_timespan: str = field(default_factory=lambda: os.getenv("DEFAULT_TIMESPAN", "1day"))
+    alpaca_api_key: str = ""
+    alpaca_api_secret: str = ""
+    alpaca_base_url: str = "https://paper-api.alpaca.markets"
+    alpaca_data_url: str = "https://data.alpaca.markets/v2"
+
+    twelvedata_api_key: str = ""
+    alphavantage_api_key: str = ""
+    openai_api_key: str = ""
+    use_sentiment: bool = True
+    use_finnhub: bool = False
+    sentiment_cache_ttl: int = 300
+
+    universe_fallback_csv: Path = Path("universe/fallback_universe.csv")
+    microcap_etfs: List[str] = field(default_factory=lambda: _split_symbols(DEFAULT_MICROCAP_ETFS))
+
+    scheduler_interval_seconds: int = 900
+    max_positions: int = 5
+    daily_budget: float = 10000.0
+    price_staleness_seconds: int = 60
+    portfolio_state_path: Path = Path("data/portfolio_state.json")
+    initial_equity: float = 100000.0
+    max_daily_loss_pct: float = 0.03
+    max_position_pct: float = 0.10
+    atr_multiplier: float = 2.5
+    min_confidence: float = 0.45
+    default_timespan: str = "1day"
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> "Settings":
+        """Build settings from a single environment snapshot; the first non-empty alias wins."""
+
+        def get(*names: str, cast: Callable[[str], Any] = str, default: Any = "") -> Any:
+            return _getenv_any(env, *names, cast=cast, default=default)
+
+        return cls(
+            alpaca_api_key=get("ALPACA_API_KEY", "APCA_API_KEY_ID"),
+            alpaca_api_secret=get("ALPACA_API_SECRET", "APCA_API_SECRET_KEY"),
+            alpaca_base_url=get("ALPACA_API_BASE_URL", default="https://paper-api.alpaca.markets"),
+            alpaca_data_url=get("ALPACA_API_DATA_URL", default="https://data.alpaca.markets/v2"),
+            twelvedata_api_key=get("TWELVEDATA_API_KEY", "TWELVEDATA_KEY"),
+            alphavantage_api_key=get("ALPHAVANTAGE_API_KEY", "ALPHAVANTAGE_KEY", "ALPHA_VANTAGE_KEY"),
+            openai_api_key=get("OPENAI_API_KEY"),
+            use_sentiment=get("USE_SENTIMENT", cast=lambda raw: raw.lower() != "false", default=True),
+            use_finnhub=get("USE_FINNHUB", cast=lambda raw: raw.lower() == "true", default=False),
+            sentiment_cache_ttl=get("SENTIMENT_CACHE_TTL", cast=int, default=300),
+            universe_fallback_csv=get("UNIVERSE_FALLBACK_CSV", cast=Path, default=Path("universe/fallback_universe.csv")),
+            microcap_etfs=get("MICROCAP_ETFS", cast=_split_symbols, default=[])
+            or _split_symbols(DEFAULT_MICROCAP_ETFS),
+            scheduler_interval_seconds=get("SCHEDULER_INTERVAL_SECONDS", cast=int, default=900),
+            max_positions=get("MAX_POSITIONS", cast=int, default=5),
+            daily_budget=get("DAILY_BUDGET_USD", cast=float, default=10000.0),
+            price_staleness_seconds=get("PRICE_STALENESS_SECONDS", cast=int, default=60),
+            portfolio_state_path=get("PORTFOLIO_STATE_PATH", cast=Path, default=Path("data/portfolio_state.json")),
+            initial_equity=get("INITIAL_EQUITY", cast=float, default=100000.0),
+            max_daily_loss_pct=get("MAX_DAILY_LOSS_PCT", cast=float, default=0.03),
+            max_position_pct=get("MAX_POSITION_PCT", cast=float, default=0.10),
+            atr_multiplier=get("ATR_MULTIPLIER", cast=float, default=2.5),
+            min_confidence=get("MIN_CONFIDENCE", cast=float, default=0.45),
+            default_timespan=get("DEFAULT_TIMESPAN", default="1day"),
+        )
+
+
+def _getenv_any(env: Mapping[str, str], *names: str, cast: Callable[[str], T], default: T) -> T:
+    """Cast the first non-empty variable among ``names``; typed defaults are returned as-is, never re-parsed."""
+
+    for name in names:
+        raw = env.get(name)
+        if raw:
+            return cast(raw)
+    return default
+
+
+def _split_symbols(raw: str) -> List[str]:
+    return [token.strip().upper() for token in raw.split(",") if token.strip()]
 
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    settings = Settings()
-    if not settings.microcap_etfs:
-        settings.microcap_etfs = ["IWM", "IWC", "SMLF", "VTWO", "URTY"]
+    settings = Settings.from_env(MappingProxyType(dict(os.environ)))
     settings.universe_fallback_csv.parent.mkdir(parents=True, exist_ok=True)
     settings.portfolio_state_path.parent.mkdir(parents=True, exist_ok=True)
     logger.info("TWELVEDATA_API_KEY detected: %s", bool(settings.twelvedata_api_key))
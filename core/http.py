@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 429 is deliberately absent: throttling is surfaced to PriceRouter, whose cooldown decides when to retry.
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class RateLimitError(RuntimeError):
+    """Raised when a provider reports throttling in-band rather than with an HTTP 429."""
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True for provider throttling: an in-band notice or a 429 response."""
+
+    if isinstance(exc, RateLimitError):
+        return True
+    response = getattr(exc, "response", None)
+    return response is not None and getattr(response, "status_code", None) == 429
+
+
+def build_session(
+    headers: Optional[Dict[str, str]] = None,
+    *,
+    pool_connections: int = 16,
+    pool_maxsize: int = 32,
+    retries: int = 3,
+    backoff_factor: float = 0.2,
+    backoff_jitter: float = 0.2,
+) -> requests.Session:
+    """
+    Return a keep-alive session with pooled connections and retry/backoff on transient 5xx statuses.
+    Retries back off exponentially with up to ``backoff_jitter`` seconds of random jitter so pooled workers
+    failing together do not retry in lockstep; ``Retry-After`` is ignored so a retry never parks a worker for long.
+    """
+
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    # Mount both schemes so URL overrides (e.g. a local http proxy for ALPACA_API_DATA_URL) keep pooling/retries.
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
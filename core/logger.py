@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import logging
 import sys
-from functools import lru_cache
+
+_configured = False
 
 
 def _configure_root_logger() -> None:
+    global _configured
+    if _configured:
+        return
     handler = logging.StreamHandler(sys.stdout)
     formatter = logging.Formatter(
         fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
@@ -17,9 +21,12 @@ def _configure_root_logger() -> None:
     root.setLevel(logging.INFO)
     if not root.handlers:
         root.addHandler(handler)
+    _configured = True
+
+
+_configure_root_logger()
 
 
-@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
-    _configure_root_logger()
+    # logging.getLogger already caches by name; no extra memoization needed.
     return logging.getLogger(name)
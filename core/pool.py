@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+IO_POOL_WORKERS = 16
+
+# One pool for every blocking provider/broker fan-out so the thread count is fixed for the process and
+# threads are reused across cycles. Only the cycle thread should wait on its futures: a task already
+# running on the pool that submits more work and blocks on it can deadlock a saturated pool.
+io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="io")
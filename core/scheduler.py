@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import asyncio
-import time
+import heapq
 from dataclasses import dataclass
-from typing import Awaitable, Callable, List
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, TypeVar
 
 from core.logger import get_logger
+from core.pool import io_pool
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ScheduledJob:
     name: str
     interval_seconds: int
@@ -18,10 +21,12 @@ class ScheduledJob:
 
 
 class Scheduler:
-    """Minimal async scheduler that repeatedly runs registered coroutines."""
+    """Minimal async scheduler that dispatches registered coroutines from a single deadline heap."""
 
     def __init__(self) -> None:
         self._jobs: List[ScheduledJob] = []
+        self._heap: List[Tuple[float, int, ScheduledJob]] = []
+        self._running: Dict[int, asyncio.Task] = {}
 
     def register(self, name: str, factory: Callable[[], Awaitable[None]], interval_seconds: int) -> None:
         self._jobs.append(ScheduledJob(name=name, factory=factory, interval_seconds=interval_seconds))
@@ -31,16 +36,41 @@ class Scheduler:
         if not self._jobs:
             logger.warning("No scheduled jobs registered; scheduler idle")
             return
-        await asyncio.gather(*(self._run(job) for job in self._jobs))
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # (deadline, registration index, job); the index breaks deadline ties deterministically.
+        self._heap = [(now, index, job) for index, job in enumerate(self._jobs)]
+        heapq.heapify(self._heap)
+        try:
+            while True:
+                deadline, index, job = heapq.heappop(self._heap)
+                await asyncio.sleep(max(deadline - loop.time(), 0))
+                running = self._running.get(index)
+                if running is not None and not running.done():
+                    logger.warning("Job %s still running; skipping this tick", job.name)
+                else:
+                    self._running[index] = asyncio.create_task(self._run(job), name=job.name)
+                # Absolute deadlines on the loop's monotonic clock keep ticks on schedule;
+                # a job that overran a whole interval resumes now instead of bursting.
+                next_deadline = deadline + job.interval_seconds
+                heapq.heappush(self._heap, (max(next_deadline, loop.time()), index, job))
+        finally:
+            for task in self._running.values():
+                task.cancel()
+
+    async def run_io(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call (provider HTTP, file I/O) on the shared I/O pool."""
+
+        return await asyncio.get_running_loop().run_in_executor(io_pool, fn, *args)
+
+    def close(self) -> None:
+        """Cancel running jobs; call on SIGTERM/shutdown."""
+
+        for task in self._running.values():
+            task.cancel()
 
     async def _run(self, job: ScheduledJob) -> None:
-        logger.info("Starting job %s", job.name)
-        while True:
-            start = time.time()
-            try:
-                await job.factory()
-            except Exception as exc:  # pragma: no cover - defensive log
-                logger.exception("Job %s failed: %s", job.name, exc)
-            elapsed = time.time() - start
-            wait_for = max(job.interval_seconds - elapsed, 0)
-            await asyncio.sleep(wait_for)
+        try:
+            await job.factory()
+        except Exception as exc:  # pragma: no cover - defensive log
+            logger.exception("Job %s failed: %s", job.name, exc)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - dependency missing
+    orjson = None  # type: ignore
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON with orjson when available, falling back to the stdlib parser."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode JSON to UTF-8 bytes with orjson when available; ``indent`` uses two spaces."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
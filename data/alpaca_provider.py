@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-import requests
+import numpy as np
 
+from core.cache import TTLCache
 from core.config import get_settings
+from core.http import build_session, is_rate_limited
 from core.logger import get_logger
+from core.serialization import loads
+from data.bars import bars_from_columns, empty_bars, parse_timestamps
 
 logger = get_logger(__name__)
 
+PRICE_CACHE_TTL = 5
+BARS_CACHE_TTL = 60
+# Multi-symbol endpoints: tickers per request and the API's max data points per page.
+BATCH_SYMBOLS = 100
+BATCH_PAGE_LIMIT = 10000
+TIMEFRAME_MAP = {"1day": "1Day", "1hour": "1Hour", "1min": "1Min", "5min": "5Min"}
+
 
 class AlpacaProvider:
     """Market data provider backed by the Alpaca data API."""
@@ -21,6 +31,18 @@ class AlpacaProvider:
         self.api_secret = settings.alpaca_api_secret
         if not self.api_key or not self.api_secret:
             logger.warning("AlpacaProvider missing credentials; calls will fail until configured")
+        self._session = build_session(self._headers())
+        self._price_cache = TTLCache(maxsize=1024, ttl=PRICE_CACHE_TTL)
+        self._bars_cache = TTLCache(maxsize=1024, ttl=BARS_CACHE_TTL)
+
+    def __enter__(self) -> "AlpacaProvider":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._session.close()
 
     def _headers(self) -> Dict[str, str]:
         return {"APCA-API-KEY-ID": self.api_key, "APCA-API-SECRET-KEY": self.api_secret}
@@ -28,49 +50,143 @@ class AlpacaProvider:
     def get_price(self, symbol: str) -> Optional[float]:
         if not self.api_key or not self.api_secret:
             return None
-        url = f"{self.base_url}/stocks/{symbol.upper()}/trades/latest"
-        try:
-            response = requests.get(url, headers=self._headers(), timeout=10)
-            response.raise_for_status()
-            payload = response.json()
-            trade = payload.get("trade")
-            if not trade:
-                return None
-            return float(trade.get("p", 0.0))
-        except Exception as exc:  # pragma: no cover - network guard
-            logger.warning("Alpaca price fetch failed for %s: %s", symbol, exc)
+        symbol = symbol.upper()
+        cached = self._price_cache.get(symbol)
+        if cached is not None:
+            return cached
+        url = f"{self.base_url}/stocks/{symbol}/trades/latest"
+        response = self._session.get(url, timeout=10)
+        response.raise_for_status()
+        payload = loads(response.content)
+        trade = payload.get("trade")
+        if not trade:
             return None
+        price = float(trade.get("p", 0.0))
+        self._price_cache[symbol] = price
+        return price
 
-    def get_aggregates(self, symbol: str, timespan: str = "1day", limit: int = 60) -> List[Dict[str, float]]:
+    def get_aggregates(self, symbol: str, timespan: str = "1day", limit: int = 60) -> np.ndarray:
         if not self.api_key or not self.api_secret:
-            return []
-        timeframe = self._normalize_timespan(timespan)
-        url = f"{self.base_url}/stocks/{symbol.upper()}/bars"
+            return empty_bars()
+        symbol = symbol.upper()
+        timeframe = _timeframe(timespan)
+        cache_key = (symbol, timeframe, limit)
+        cached = self._bars_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        url = f"{self.base_url}/stocks/{symbol}/bars"
         params = {"timeframe": timeframe, "limit": limit, "adjustment": "split"}
-        try:
-            response = requests.get(url, headers=self._headers(), params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json().get("bars", []) or []
-            return [self._normalize_bar(item) for item in data]
-        except Exception as exc:  # pragma: no cover - network guard
-            logger.warning("Alpaca aggregates failed for %s: %s", symbol, exc)
-            return []
-
-    def _normalize_timespan(self, timespan: str) -> str:
-        mapping = {"1day": "1Day", "1hour": "1Hour", "1min": "1Min", "5min": "5Min"}
-        return mapping.get(timespan.lower(), "1Day")
-
-    def _normalize_bar(self, bar: Dict[str, float]) -> Dict[str, float]:
-        return {
-            "open": float(bar["o"]),
-            "high": float(bar["h"]),
-            "low": float(bar["l"]),
-            "close": float(bar["c"]),
-            "volume": float(bar["v"]),
-            "timestamp": datetime.fromisoformat(bar["t"].replace("Z", "+00:00")).timestamp(),
-        }
-
-    def get_intraday_1m(self, symbol: str, limit: int = 60) -> List[Dict[str, float]]:
+        response = self._session.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        data = loads(response.content).get("bars", []) or []
+        bars = self._normalize_bars(data)
+        if len(bars):
+            self._bars_cache[cache_key] = bars
+        return bars
+
+    def get_aggregates_batch(self, symbols: Sequence[str], timespan: str = "1day", limit: int = 60) -> Dict[str, np.ndarray]:
+        """
+        Fetch bars for many symbols through the multi-symbol ``/stocks/bars`` endpoint.
+        Issues one request per page of up to ``BATCH_SYMBOLS`` tickers instead of one per symbol,
+        and primes the per-symbol cache so later ``get_aggregates`` calls are free.
+        """
+
+        if not self.api_key or not self.api_secret:
+            return {}
+        timeframe = _timeframe(timespan)
+        result: Dict[str, np.ndarray] = {}
+        pending: List[str] = []
+        for symbol in dict.fromkeys(sym.upper() for sym in symbols):
+            cached = self._bars_cache.get((symbol, timeframe, limit))
+            if cached is not None:
+                result[symbol] = cached
+            else:
+                pending.append(symbol)
+
+        url = f"{self.base_url}/stocks/bars"
+        for start in range(0, len(pending), BATCH_SYMBOLS):
+            chunk = pending[start : start + BATCH_SYMBOLS]
+            params = {
+                "symbols": ",".join(chunk),
+                "timeframe": timeframe,
+                "limit": BATCH_PAGE_LIMIT,
+                "adjustment": "split",
+            }
+            raw: Dict[str, List[Dict[str, Any]]] = {}
+            try:
+                while True:
+                    response = self._session.get(url, params=params, timeout=10)
+                    response.raise_for_status()
+                    payload = loads(response.content)
+                    for symbol, data in (payload.get("bars") or {}).items():
+                        raw.setdefault(symbol, []).extend(data or [])
+                    page_token = payload.get("next_page_token")
+                    if not page_token:
+                        break
+                    params["page_token"] = page_token
+            except Exception as exc:  # pragma: no cover - network guard
+                if is_rate_limited(exc):
+                    raise
+                logger.warning("Alpaca batch aggregates failed for %s symbols: %s", len(chunk), exc)
+                continue
+            for symbol, data in raw.items():
+                bars = self._normalize_bars(data[-limit:])
+                if len(bars):
+                    self._bars_cache[(symbol, timeframe, limit)] = bars
+                    result[symbol] = bars
+        return result
+
+    def get_snapshots(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch latest trade plus current/previous daily bars for many symbols via ``/stocks/snapshots``.
+        Returns ``{symbol: {"price", "day", "prev_day"}}`` and primes the per-symbol price cache.
+        """
+
+        if not self.api_key or not self.api_secret:
+            return {}
+        pending = list(dict.fromkeys(sym.upper() for sym in symbols))
+        url = f"{self.base_url}/stocks/snapshots"
+        snapshots: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(pending), BATCH_SYMBOLS):
+            chunk = pending[start : start + BATCH_SYMBOLS]
+            try:
+                response = self._session.get(url, params={"symbols": ",".join(chunk)}, timeout=10)
+                response.raise_for_status()
+                payload = loads(response.content)
+            except Exception as exc:  # pragma: no cover - network guard
+                if is_rate_limited(exc):
+                    raise
+                logger.warning("Alpaca snapshots failed for %s symbols: %s", len(chunk), exc)
+                continue
+            for symbol, snapshot in payload.items():
+                trade = (snapshot or {}).get("latestTrade") or {}
+                if not trade.get("p"):
+                    continue
+                price = float(trade["p"])
+                self._price_cache[symbol] = price
+                snapshots[symbol] = {
+                    "price": price,
+                    "day": snapshot.get("dailyBar") or {},
+                    "prev_day": snapshot.get("prevDailyBar") or {},
+                }
+        return snapshots
+
+    def _normalize_bars(self, data: List[Dict[str, Any]]) -> np.ndarray:
+        return bars_from_columns(
+            open_=[bar["o"] for bar in data],
+            high=[bar["h"] for bar in data],
+            low=[bar["l"] for bar in data],
+            close=[bar["c"] for bar in data],
+            volume=[bar["v"] for bar in data],
+            timestamp=parse_timestamps([bar["t"] for bar in data]),
+        )
+
+    def get_intraday_1m(self, symbol: str, limit: int = 60) -> np.ndarray:
         """Convenience wrapper for 1-minute bars."""
 
         return self.get_aggregates(symbol, timespan="1min", limit=limit)
+
+
+def _timeframe(timespan: str) -> str:
+    # Callers pass canonical lower-case spans; only fall back to lower() for anything else.
+    return TIMEFRAME_MAP.get(timespan) or TIMEFRAME_MAP.get(timespan.lower(), "1Day")
@@ -1,15 +1,30 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Dict, List, Optional
+import re
+from itertools import islice
+from typing import Any, Dict, Iterable, Optional, Tuple
 
-import requests
+import numpy as np
 
+from core.cache import TTLCache
 from core.config import get_settings
+from core.http import RateLimitError, build_session
 from core.logger import get_logger
+from core.serialization import loads
+from data.bars import bars_from_columns, empty_bars, parse_timestamps
 
 logger = get_logger(__name__)
 
+PRICE_CACHE_TTL = 5
+# AlphaVantage's "compact" payload holds the latest 100 rows; only ask for "full" beyond that. The cap is the
+# API's, so it can't be raised: the 120-bar ML window and 600-bar training pull download a full payload (about
+# a month of 5-minute bars) to keep a few hundred rows. Same single API credit, larger transfer; the bars
+# cache keeps it to once per BARS_CACHE_TTL per symbol.
+COMPACT_OUTPUT_ROWS = 100
+BARS_CACHE_TTL = 60
+# Wording of AlphaVantage's per-minute and per-day quota notices.
+THROTTLE_NOTICE = re.compile(r"rate limit|call frequency|requests per (?:minute|day)", re.IGNORECASE)
+
 
 class AlphaVantageProvider:
     BASE_URL = "https://www.alphavantage.co/query"
@@ -19,80 +34,110 @@ class AlphaVantageProvider:
         self.api_key = settings.alphavantage_api_key
         if not self.api_key:
             logger.warning("AlphaVantageProvider initialized without API key")
+        self._session = build_session()
+        # Sent with every request by the session, so call sites only build per-call params.
+        self._session.params = {"apikey": self.api_key}
+        self._price_cache = TTLCache(maxsize=1024, ttl=PRICE_CACHE_TTL)
+        self._bars_cache = TTLCache(maxsize=1024, ttl=BARS_CACHE_TTL)
+
+    def __enter__(self) -> "AlphaVantageProvider":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._session.close()
 
     def get_price(self, symbol: str) -> Optional[float]:
         if not self.api_key:
             return None
-        params = {"function": "GLOBAL_QUOTE", "symbol": symbol.upper(), "apikey": self.api_key}
-        try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            payload = response.json().get("Global Quote", {})
-            price = payload.get("05. price")
-            if price is None:
-                return None
-            return float(price)
-        except Exception as exc:  # pragma: no cover - network guard
-            logger.warning("AlphaVantage price fetch failed for %s: %s", symbol, exc)
+        symbol = symbol.upper()
+        cached = self._price_cache.get(symbol)
+        if cached is not None:
+            return cached
+        params = {"function": "GLOBAL_QUOTE", "symbol": symbol}
+        response = self._session.get(self.BASE_URL, params=params, timeout=10)
+        response.raise_for_status()
+        payload = _raise_if_throttled(loads(response.content)).get("Global Quote", {})
+        price = payload.get("05. price")
+        if price is None:
             return None
+        self._price_cache[symbol] = float(price)
+        return float(price)
 
-    def get_aggregates(self, symbol: str, timespan: str = "1day", limit: int = 60) -> List[Dict[str, float]]:
+    def get_aggregates(self, symbol: str, timespan: str = "1day", limit: int = 60) -> np.ndarray:
         if not self.api_key:
-            return []
-        params = {"function": "TIME_SERIES_DAILY_ADJUSTED", "symbol": symbol.upper(), "apikey": self.api_key}
-        try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json().get("Time Series (Daily)", {}) or {}
-        except Exception as exc:  # pragma: no cover - network guard
-            logger.warning("AlphaVantage aggregates failed for %s: %s", symbol, exc)
-            return []
-        normalized: List[Dict[str, float]] = []
-        for date_str, values in list(data.items())[:limit]:
-            normalized.append(
-                {
-                    "open": float(values["1. open"]),
-                    "high": float(values["2. high"]),
-                    "low": float(values["3. low"]),
-                    "close": float(values["4. close"]),
-                    "volume": float(values["6. volume"]),
-                    "timestamp": datetime.fromisoformat(date_str).timestamp(),
-                }
-            )
-        normalized.sort(key=lambda row: row["timestamp"])
-        return normalized
-
-    def get_intraday_5m(self, symbol: str, limit: int = 60) -> List[Dict[str, float]]:
+            return empty_bars()
+        symbol = symbol.upper()
+        cache_key = (symbol, "1day", limit)
+        cached = self._bars_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        params = {
+            "function": "TIME_SERIES_DAILY_ADJUSTED",
+            "symbol": symbol,
+            "outputsize": _output_size(limit),
+        }
+        response = self._session.get(self.BASE_URL, params=params, timeout=10)
+        response.raise_for_status()
+        data = _raise_if_throttled(loads(response.content)).get("Time Series (Daily)", {}) or {}
+        bars = self._normalize_series(islice(data.items(), limit), volume_key="6. volume")
+        if len(bars):
+            self._bars_cache[cache_key] = bars
+        return bars
+
+    def get_intraday_5m(self, symbol: str, limit: int = 60) -> np.ndarray:
         """Fetch 5-minute intraday bars."""
 
         if not self.api_key:
-            return []
+            return empty_bars()
+        symbol = symbol.upper()
+        cache_key = (symbol, "5min", limit)
+        cached = self._bars_cache.get(cache_key)
+        if cached is not None:
+            return cached
         params = {
             "function": "TIME_SERIES_INTRADAY",
-            "symbol": symbol.upper(),
+            "symbol": symbol,
             "interval": "5min",
-            "apikey": self.api_key,
-            "outputsize": "compact",
+            "outputsize": _output_size(limit),
         }
-        try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json().get("Time Series (5min)", {}) or {}
-        except Exception as exc:  # pragma: no cover - network guard
-            logger.warning("AlphaVantage intraday aggregates failed for %s: %s", symbol, exc)
-            return []
-
-        normalized: List[Dict[str, float]] = []
-        for date_str, values in list(data.items())[:limit]:
-            normalized.append(
-                {
-                    "open": float(values["1. open"]),
-                    "high": float(values["2. high"]),
-                    "low": float(values["3. low"]),
-                    "close": float(values["4. close"]),
-                    "volume": float(values.get("5. volume", 0.0)),
-                    "timestamp": datetime.fromisoformat(date_str).timestamp(),
-                }
-            )
-        normalized.sort(key=lambda row: row["timestamp"])
-        return normalized
+        response = self._session.get(self.BASE_URL, params=params, timeout=10)
+        response.raise_for_status()
+        data = _raise_if_throttled(loads(response.content)).get("Time Series (5min)", {}) or {}
+
+        bars = self._normalize_series(islice(data.items(), limit), volume_key="5. volume")
+        if len(bars):
+            self._bars_cache[cache_key] = bars
+        return bars
+
+    def _normalize_series(self, rows: Iterable[Tuple[str, Dict[str, Any]]], volume_key: str) -> np.ndarray:
+        """Convert AlphaVantage ``{date: {"1. open": ...}}`` rows into bars sorted oldest first."""
+
+        rows = list(rows)
+        bars = bars_from_columns(
+            open_=[values["1. open"] for _, values in rows],
+            high=[values["2. high"] for _, values in rows],
+            low=[values["3. low"] for _, values in rows],
+            close=[values["4. close"] for _, values in rows],
+            volume=[values.get(volume_key, 0.0) for _, values in rows],
+            timestamp=parse_timestamps([date_str for date_str, _ in rows]),
+        )
+        bars.sort(order="timestamp")
+        return bars
+
+
+def _output_size(limit: int) -> str:
+    return "compact" if limit <= COMPACT_OUTPUT_ROWS else "full"
+
+
+def _raise_if_throttled(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # AlphaVantage answers HTTP 200 with a "Note"/"Information" message instead of data. Only the quota
+    # wording is a throttle; premium-endpoint and bad-parameter notices are plain errors, not a cooldown.
+    notice = payload.get("Note") or payload.get("Information")
+    if notice:
+        if THROTTLE_NOTICE.search(notice):
+            raise RateLimitError(f"AlphaVantage rate limit (429): {notice}")
+        raise RuntimeError(f"AlphaVantage error: {notice}")
+    return payload
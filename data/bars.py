@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+# Prices stay float64: sub-dollar quotes and entry/stop levels need more than float32's ~7 significant digits.
+# Volume only feeds ratios and filters, so float32 is enough there; timestamps stay int64 seconds.
+BAR_DTYPE = np.dtype(
+    [
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("volume", "f4"),
+        ("timestamp", "i8"),
+    ]
+)
+
+_EPOCH = pd.Timestamp(0, tz="UTC")
+
+
+def empty_bars() -> np.ndarray:
+    return np.empty(0, dtype=BAR_DTYPE)
+
+
+def bars_from_columns(
+    open_: Sequence[float],
+    high: Sequence[float],
+    low: Sequence[float],
+    close: Sequence[float],
+    volume: Sequence[float],
+    timestamp: Sequence[int],
+) -> np.ndarray:
+    """Pack per-column sequences (numbers or numeric strings) into a structured OHLCV array."""
+
+    bars = np.empty(len(close), dtype=BAR_DTYPE)
+    bars["open"] = np.asarray(open_, dtype=np.float64)
+    bars["high"] = np.asarray(high, dtype=np.float64)
+    bars["low"] = np.asarray(low, dtype=np.float64)
+    bars["close"] = np.asarray(close, dtype=np.float64)
+    bars["volume"] = np.asarray(volume, dtype=np.float32)
+    bars["timestamp"] = np.asarray(timestamp, dtype=np.int64)
+    return bars
+
+
+def bars_from_frame(frame: pd.DataFrame) -> np.ndarray:
+    """Pack an OHLCV frame with a tz-aware ``timestamp`` column into a structured bar array."""
+
+    return bars_from_columns(
+        open_=frame["open"].to_numpy(),
+        high=frame["high"].to_numpy(),
+        low=frame["low"].to_numpy(),
+        close=frame["close"].to_numpy(),
+        volume=frame["volume"].to_numpy(),
+        timestamp=(frame["timestamp"] - _EPOCH) // pd.Timedelta(seconds=1),
+    )
+
+
+def parse_timestamps(values: Sequence[str]) -> np.ndarray:
+    """Parse ISO-8601 strings (``Z``-suffixed or naive UTC) to epoch seconds in one vectorized pass."""
+
+    if not len(values):
+        return np.empty(0, dtype=np.int64)
+    parsed = pd.to_datetime(pd.Index(values), utc=True, format="ISO8601")
+    return np.asarray((parsed - _EPOCH) // pd.Timedelta(seconds=1), dtype=np.int64)
@@ -1,19 +1,54 @@
 from __future__ import annotations
 
-from typing import Dict, List, Sequence
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+from core.cache import TTLCache
 from core.config import get_settings
+from core.http import is_rate_limited
 from core.logger import get_logger
 from data.alpaca_provider import AlpacaProvider
 from data.alphavantage_provider import AlphaVantageProvider
+from data.bars import bars_from_frame
 from data.twelvedata_provider import TwelveDataProvider
 
 logger = get_logger(__name__)
 settings = get_settings()
 _providers_cache: Sequence[object] | None = None
 
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+# Snapshot prices price bracket orders, so they expire on the same staleness budget allocation enforces.
+SNAPSHOT_TTL = settings.price_staleness_seconds
+PRICE_CACHE_TTL = 5
+AGGREGATES_CACHE_TTL = 60
+FAILURE_CACHE_TTL = 30
+# Shared across PriceRouter instances (each module builds its own router) so one fetch serves all.
+_snapshot_cache = TTLCache(maxsize=4096, ttl=SNAPSHOT_TTL)
+_price_cache = TTLCache(maxsize=8192, ttl=PRICE_CACHE_TTL)
+_aggregates_cache = TTLCache(maxsize=4096, ttl=AGGREGATES_CACHE_TTL)
+# Epoch second at which each symbol's newest raw (pre-resample) bar closed. The last 5-minute bucket is
+# usually partial, so its label says little about how fresh its close is.
+_bar_ends = TTLCache(maxsize=4096, ttl=AGGREGATES_CACHE_TTL)
+# Symbols every provider just failed on; short-lived so retries resume soon without hammering 429s.
+_failure_cache = TTLCache(maxsize=4096, ttl=FAILURE_CACHE_TTL)
+DEAD_SYMBOL_TTL = 600
+DEAD_SYMBOL_STRIKES = 2
+# Lookups where every provider returned a successful response without data (single-symbol provider
+# calls raise on transport/HTTP errors, which never count). Repeated misses mark the symbol dead
+# (delisted/typo) for ten minutes.
+_empty_strikes = TTLCache(maxsize=4096, ttl=DEAD_SYMBOL_TTL)
+_dead_symbols = TTLCache(maxsize=4096, ttl=DEAD_SYMBOL_TTL)
+RATE_LIMIT_COOLDOWN = 60
+MAX_RATE_LIMIT_COOLDOWN = 300
+# Per provider class: (monotonic time the cooldown ends, consecutive rate-limit hits).
+_cooldowns: Dict[type, Tuple[float, int]] = {}
+# Fan-out workers report outcomes concurrently; updates to _cooldowns are read-modify-write.
+_cooldown_lock = threading.Lock()
+
 
 def resample_to_5m(bars) -> pd.DataFrame:
     """Normalize raw bars to 5-minute OHLCV buckets."""
@@ -65,62 +100,257 @@ def _build_providers() -> Sequence[object]:
     return providers
 
 
+def _resample(symbol: str, bars: np.ndarray, bar_seconds: int) -> pd.DataFrame:
+    if len(bars):
+        _bar_ends[symbol] = float(bars["timestamp"].max()) + bar_seconds
+    return resample_to_5m(bars)
+
+
+def _in_cooldown(provider: object) -> bool:
+    key = type(provider)
+    with _cooldown_lock:
+        state = _cooldowns.get(key)
+        if state is None or state[0] == 0:
+            return False
+        if state[0] > time.monotonic():
+            return True
+        # Cooldown elapsed: keep the hit count so a repeat 429 backs off further, but allow calls again.
+        _cooldowns[key] = (0, state[1])
+    logger.info("%s cooldown ended; resuming requests", key.__name__)
+    return False
+
+
+def _record_outcome(provider: object, exc: Exception | None) -> None:
+    key = type(provider)
+    rate_limited = exc is not None and is_rate_limited(exc)
+    if exc is not None and not rate_limited:
+        return
+    with _cooldown_lock:
+        ends_at, hits = _cooldowns.get(key, (0, 0))
+        if not rate_limited:
+            # A straggler that succeeded while a cooldown is running must not cut it short.
+            if key in _cooldowns and ends_at == 0:
+                del _cooldowns[key]
+            return
+        if ends_at > time.monotonic():
+            # The rest of a concurrent burst: one escalation and one log line per cooldown.
+            return
+        hits += 1
+        delay = min(RATE_LIMIT_COOLDOWN * 2 ** (hits - 1), MAX_RATE_LIMIT_COOLDOWN)
+        _cooldowns[key] = (time.monotonic() + delay, hits)
+    logger.warning("%s rate limited; skipping it for %ss", key.__name__, delay)
+
+
+def _raise_cached_failure(key: tuple, message: str) -> None:
+    if key in _dead_symbols:
+        raise RuntimeError(f"{message} (no provider has data; cached)")
+    sentinel = object()
+    error = _failure_cache.get(key, sentinel)
+    if error is not sentinel:
+        raise RuntimeError(f"{message} (cached failure)") from error
+
+
+def _cached_price(key: str) -> Optional[float]:
+    # A snapshot miss falls through to the price cache, which records the miss for this lookup.
+    snapshot = _snapshot_cache.get(key, count_miss=False)
+    if snapshot is not None:
+        return snapshot["price"]
+    return _price_cache.get(key)
+
+
+def _remember_failure(key: tuple, last_error: Exception | None, answered: bool) -> None:
+    _failure_cache[key] = last_error
+    if last_error is not None or not answered:
+        return
+    strikes = _empty_strikes.get(key, 0) + 1
+    _empty_strikes[key] = strikes
+    if strikes >= DEAD_SYMBOL_STRIKES:
+        _dead_symbols[key] = True
+        logger.info("No provider has data for %s; skipping it for %ss", key[1], DEAD_SYMBOL_TTL)
+
+
 class PriceRouter:
     """Funnel price + aggregate requests across multiple providers."""
 
     def __init__(self) -> None:
         self.providers = _build_providers()
 
+    def prime_cycle(self, symbols: Sequence[str], windows: Sequence[int]) -> int:
+        """
+        Bulk-load 5-minute aggregates for each of ``windows`` for ``symbols`` using the providers'
+        multi-symbol endpoints, one request per chunk instead of per symbol, so the cycle's
+        ``get_aggregates`` calls are served from the cache until it expires. Prices are not primed
+        here: only allocated symbols are priced, and ``prime_prices`` covers those right before use.
+        """
+
+        if not windows:
+            return 0
+        return self._prime_aggregates(symbols, windows)
+
+    def prime_prices(self, symbols: Sequence[str]) -> int:
+        """
+        Bulk-load latest prices for the ``symbols`` not already cached, one multi-symbol request
+        per chunk, so a following run of ``get_price`` calls is served from the snapshot cache.
+        """
+
+        pending = [
+            symbol
+            for symbol in dict.fromkeys(s.upper() for s in symbols)
+            if symbol not in _snapshot_cache and symbol not in _price_cache
+        ]
+        total = len(pending)
+        if not pending:
+            return 0
+        for provider in self.providers:
+            if not pending:
+                break
+            if _in_cooldown(provider):
+                continue
+            try:
+                if isinstance(provider, AlpacaProvider):
+                    snapshots: Dict[str, Dict[str, Any]] = provider.get_snapshots(pending)
+                elif isinstance(provider, TwelveDataProvider):
+                    snapshots = {symbol: {"price": price} for symbol, price in provider.get_prices_batch(pending).items()}
+                else:
+                    continue
+            except Exception as exc:  # pragma: no cover - network guard
+                _record_outcome(provider, exc)
+                continue
+            for symbol, snapshot in snapshots.items():
+                _snapshot_cache[symbol] = snapshot
+            pending = [symbol for symbol in pending if symbol not in snapshots]
+        logger.info("PriceRouter primed %s/%s snapshots", total - len(pending), total)
+        return total - len(pending)
+
+    def _prime_aggregates(self, symbols: Sequence[str], windows: Sequence[int]) -> int:
+        # AlphaVantage has no multi-symbol endpoint, so priming deliberately skips it even though per-symbol
+        # get_aggregates tries it first; symbols left unprimed fall through to that order on first use.
+        # Windows are all trailing slices of the same 1-minute series: fetch the longest once, slice the rest.
+        windows = sorted(set(windows))
+        limit = windows[-1]
+        pending = [
+            symbol
+            for symbol in dict.fromkeys(s.upper() for s in symbols)
+            if any((symbol, window) not in _aggregates_cache for window in windows)
+        ]
+        total = len(pending)
+        for provider in self.providers:
+            if not pending:
+                break
+            if _in_cooldown(provider) or not isinstance(provider, (AlpacaProvider, TwelveDataProvider)):
+                continue
+            try:
+                batch = provider.get_aggregates_batch(pending, timespan="1min", limit=limit)
+            except Exception as exc:  # pragma: no cover - network guard
+                _record_outcome(provider, exc)
+                continue
+            for symbol, bars in batch.items():
+                for window in windows:
+                    frame = _resample(symbol, bars[-window:], 60)
+                    if not frame.empty:
+                        _aggregates_cache[(symbol, window)] = bars_from_frame(frame)
+            pending = [symbol for symbol in pending if (symbol, limit) not in _aggregates_cache]
+        logger.info("PriceRouter primed %s/%s aggregates (windows=%s)", total - len(pending), total, windows)
+        return total - len(pending)
+
     def get_price(self, symbol: str) -> float:
+        symbol = cache_key = symbol.upper()
+        cached = _cached_price(cache_key)
+        if cached is not None:
+            return cached
+        _raise_cached_failure(("price", cache_key), f"All providers failed to return price for {symbol}")
         last_error: Exception | None = None
+        answered = False
         for provider in self.providers:
+            if _in_cooldown(provider):
+                continue
             try:
                 price = provider.get_price(symbol)  # type: ignore[attr-defined]
+                _record_outcome(provider, None)
+                answered = True
                 if price is None:
                     continue
+                _price_cache[cache_key] = price
                 return price
             except Exception as exc:  # pragma: no cover - network guard
-                provider_name = provider.__class__.__name__
-                logger.warning("%s price lookup failed for %s: %s", provider_name, symbol, exc)
-                if "429" in str(exc):
-                    logger.warning("Rate limit hit on %s, skipping %s", provider_name, symbol)
+                if not is_rate_limited(exc):
+                    logger.warning("%s price lookup failed for %s: %s", provider.__class__.__name__, symbol, exc)
+                _record_outcome(provider, exc)
                 last_error = exc
+        _remember_failure(("price", cache_key), last_error, answered)
         raise RuntimeError(f"All providers failed to return price for {symbol}") from last_error
 
-    def get_aggregates(self, symbol: str, window: int = 60) -> List[Dict[str, float]]:
+    def get_aggregates(self, symbol: str, window: int = 60) -> np.ndarray:
         """
         Return last ``window`` minutes of 5-minute bars.
         Provider priority: AlphaVantage → TwelveData → Alpaca.
         """
 
+        symbol = symbol.upper()
+        cache_key = (symbol, window)
+        cached = _aggregates_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        _raise_cached_failure(("aggregates",) + cache_key, f"All providers failed to return aggregates for {symbol}")
         last_error: Exception | None = None
+        answered = False
         for provider in self.providers:
+            if _in_cooldown(provider):
+                continue
             provider_name = provider.__class__.__name__
             try:
                 frame: pd.DataFrame
                 if isinstance(provider, AlphaVantageProvider):
                     bars = provider.get_intraday_5m(symbol, limit=window)
-                    frame = resample_to_5m(bars)
+                    frame = _resample(symbol, bars, 300)
                 elif isinstance(provider, TwelveDataProvider):
                     bars = provider.get_intraday_1m(symbol, limit=window)
-                    frame = resample_to_5m(bars)
+                    frame = _resample(symbol, bars, 60)
                 elif isinstance(provider, AlpacaProvider):
                     bars = provider.get_intraday_1m(symbol, limit=window)
-                    frame = resample_to_5m(bars)
+                    frame = _resample(symbol, bars, 60)
                 else:
                     continue
+                _record_outcome(provider, None)
+                answered = True
                 if not frame.empty:
-                    return frame.to_dict("records")
+                    resampled = bars_from_frame(frame)
+                    _aggregates_cache[cache_key] = resampled
+                    return resampled
             except Exception as exc:  # pragma: no cover - network guard
-                logger.warning("%s aggregates failed for %s: %s", provider_name, symbol, exc)
-                if "429" in str(exc):
-                    logger.warning("Rate limit hit on %s, skipping %s", provider_name, symbol)
+                if not is_rate_limited(exc):
+                    logger.warning("%s aggregates failed for %s: %s", provider_name, symbol, exc)
+                _record_outcome(provider, exc)
                 last_error = exc
+        _remember_failure(("aggregates",) + cache_key, last_error, answered)
         raise RuntimeError(f"All providers failed to return aggregates for {symbol}") from last_error
 
     @staticmethod
-    def aggregates_to_dataframe(bars: List[Dict[str, float]]) -> pd.DataFrame:
+    def last_bar_end(symbol: str) -> Optional[float]:
+        """Epoch second the newest raw bar behind ``symbol``'s cached aggregates closed, if known."""
+
+        return _bar_ends.get(symbol.upper())
+
+    @staticmethod
+    def aggregates_to_dataframe(bars: np.ndarray, already_sorted: bool = True) -> pd.DataFrame:
+        # Router output comes from resample_to_5m and is already in timestamp order.
         frame = pd.DataFrame(bars)
-        if not frame.empty:
+        if frame.empty:
+            return frame
+        if not already_sorted:
             frame = frame.sort_values("timestamp").reset_index(drop=True)
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], unit="s", utc=True)
         return frame
+
+    @staticmethod
+    def cache_stats() -> Dict[str, Tuple[int, int]]:
+        """(hits, misses) per shared router cache since start-up."""
+
+        caches = {"snapshot": _snapshot_cache, "price": _price_cache, "aggregates": _aggregates_cache}
+        return {name: (cache.hits, cache.misses) for name, cache in caches.items()}
+
+    @staticmethod
+    def aggregates_to_arrays(bars: np.ndarray) -> Dict[str, np.ndarray]:
+        """Column views over OHLCV bars, for callers that only need numbers and not a DataFrame."""
+
+        return {field: bars[field] for field in OHLCV_COLUMNS}
@@ -1,105 +1,163 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-import requests
+import numpy as np
 
+from core.cache import TTLCache
 from core.config import get_settings
+from core.http import RateLimitError, build_session, is_rate_limited
 from core.logger import get_logger
+from core.serialization import loads
+from data.bars import bars_from_columns, empty_bars, parse_timestamps
 
 logger = get_logger(__name__)
 
+PRICE_CACHE_TTL = 5
+BARS_CACHE_TTL = 60
+# Symbols per multi-symbol /time_series request.
+BATCH_SYMBOLS = 100
+INTERVAL_MAP = {"1day": "1day", "1hour": "1h", "1min": "1min"}
+
 
 class TwelveDataProvider:
     """Lightweight TwelveData wrapper for price + aggregates."""
 
     BASE_URL = "https://api.twelvedata.com"
+    TIME_SERIES_URL = f"{BASE_URL}/time_series"
 
     def __init__(self) -> None:
         settings = get_settings()
         self.api_key = settings.twelvedata_api_key
         if not self.api_key:
             logger.warning("TwelveDataProvider initialized without API key")
+        self._session = build_session()
+        # Sent with every request by the session, so call sites only build per-call params.
+        self._session.params = {"apikey": self.api_key}
+        self._price_cache = TTLCache(maxsize=1024, ttl=PRICE_CACHE_TTL)
+        self._bars_cache = TTLCache(maxsize=1024, ttl=BARS_CACHE_TTL)
+
+    def __enter__(self) -> "TwelveDataProvider":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._session.close()
 
     def get_price(self, symbol: str) -> Optional[float]:
         if not self.api_key:
             return None
-        params = {"symbol": symbol.upper(), "apikey": self.api_key, "interval": "1min", "outputsize": 1}
-        try:
-            response = requests.get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
-            response.raise_for_status()
-            values = response.json().get("values", [])
-            if not values:
-                return None
-            return float(values[0].get("close", 0.0))
-        except Exception as exc:  # pragma: no cover - network guard
-            logger.warning("TwelveData price fetch failed for %s: %s", symbol, exc)
+        symbol = symbol.upper()
+        cached = self._price_cache.get(symbol)
+        if cached is not None:
+            return cached
+        params = {"symbol": symbol, "interval": "1min", "outputsize": 1}
+        response = self._session.get(self.TIME_SERIES_URL, params=params, timeout=10)
+        response.raise_for_status()
+        values = _raise_if_throttled(loads(response.content)).get("values", [])
+        if not values:
             return None
+        price = float(values[0].get("close", 0.0))
+        self._price_cache[symbol] = price
+        return price
 
-    def get_aggregates(self, symbol: str, timespan: str = "1day", limit: int = 60) -> List[Dict[str, float]]:
+    def get_aggregates(self, symbol: str, timespan: str = "1day", limit: int = 60) -> np.ndarray:
         if not self.api_key:
-            return []
-        interval = self._normalize_timespan(timespan)
+            return empty_bars()
+        symbol = symbol.upper()
+        interval = _interval(timespan)
+        cache_key = (symbol, interval, limit)
+        cached = self._bars_cache.get(cache_key)
+        if cached is not None:
+            return cached
         params = {
-            "symbol": symbol.upper(),
+            "symbol": symbol,
             "interval": interval,
-            "apikey": self.api_key,
             "outputsize": limit,
         }
-        try:
-            response = requests.get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
-            response.raise_for_status()
-            values = response.json().get("values", []) or []
-        except Exception as exc:  # pragma: no cover - network guard
-            logger.warning("TwelveData aggregates failed for %s: %s", symbol, exc)
-            return []
-        normalized: List[Dict[str, float]] = []
-        for row in reversed(values):  # API returns newest first
-            normalized.append(
-                {
-                    "open": float(row["open"]),
-                    "high": float(row["high"]),
-                    "low": float(row["low"]),
-                    "close": float(row["close"]),
-                    "volume": float(row.get("volume", 0.0)),
-                    "timestamp": datetime.fromisoformat(row["datetime"]).timestamp(),
-                }
-            )
-        return normalized
-
-    def get_intraday_1m(self, symbol: str, limit: int = 60) -> List[Dict[str, float]]:
-        """Fetch raw 1-minute bars."""
+        response = self._session.get(self.TIME_SERIES_URL, params=params, timeout=10)
+        response.raise_for_status()
+        values = _raise_if_throttled(loads(response.content)).get("values", []) or []
+        bars = self._normalize_values(values)
+        if len(bars):
+            self._bars_cache[cache_key] = bars
+        return bars
 
+    def get_prices_batch(self, symbols: Sequence[str]) -> Dict[str, float]:
+        """Latest 1-minute close for many symbols, one request per ``BATCH_SYMBOLS`` chunk."""
+
+        series = self._time_series_batch(symbols, interval="1min", outputsize=1)
+        prices = {symbol: float(values[0]["close"]) for symbol, values in series.items() if values}
+        for symbol, price in prices.items():
+            self._price_cache[symbol] = price
+        return prices
+
+    def get_aggregates_batch(self, symbols: Sequence[str], timespan: str = "1day", limit: int = 60) -> Dict[str, np.ndarray]:
+        """Bars for many symbols, one request per ``BATCH_SYMBOLS`` chunk; symbols without data are omitted."""
+
+        interval = _interval(timespan)
+        series = self._time_series_batch(symbols, interval=interval, outputsize=limit)
+        result: Dict[str, np.ndarray] = {}
+        for symbol, values in series.items():
+            bars = self._normalize_values(values)
+            if len(bars):
+                self._bars_cache[(symbol, interval, limit)] = bars
+                result[symbol] = bars
+        return result
+
+    def _time_series_batch(self, symbols: Sequence[str], interval: str, outputsize: int) -> Dict[str, List[Dict[str, Any]]]:
         if not self.api_key:
-            return []
-        params = {
-            "symbol": symbol.upper(),
-            "interval": "1min",
-            "apikey": self.api_key,
-            "outputsize": limit,
-        }
-        try:
-            response = requests.get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
-            response.raise_for_status()
-            values = response.json().get("values", []) or []
-        except Exception as exc:  # pragma: no cover - network guard
-            logger.warning("TwelveData intraday aggregates failed for %s: %s", symbol, exc)
-            return []
-        normalized: List[Dict[str, float]] = []
-        for row in reversed(values):  # API returns newest first
-            normalized.append(
-                {
-                    "open": float(row["open"]),
-                    "high": float(row["high"]),
-                    "low": float(row["low"]),
-                    "close": float(row["close"]),
-                    "volume": float(row.get("volume", 0.0)),
-                    "timestamp": datetime.fromisoformat(row["datetime"]).timestamp(),
-                }
-            )
-        return normalized
-
-    def _normalize_timespan(self, timespan: str) -> str:
-        mapping = {"1day": "1day", "1hour": "1h", "1min": "1min"}
-        return mapping.get(timespan.lower(), "1day")
+            return {}
+        pending = list(dict.fromkeys(sym.upper() for sym in symbols))
+        series: Dict[str, List[Dict[str, Any]]] = {}
+        for start in range(0, len(pending), BATCH_SYMBOLS):
+            chunk = pending[start : start + BATCH_SYMBOLS]
+            params = {"symbol": ",".join(chunk), "interval": interval, "outputsize": outputsize}
+            try:
+                response = self._session.get(self.TIME_SERIES_URL, params=params, timeout=10)
+                response.raise_for_status()
+                payload = _raise_if_throttled(loads(response.content))
+            except Exception as exc:  # pragma: no cover - network guard
+                if is_rate_limited(exc):
+                    raise
+                logger.warning("TwelveData batch time series failed for %s symbols: %s", len(chunk), exc)
+                continue
+            # A single-symbol request returns the series itself rather than a symbol-keyed map.
+            by_symbol = {chunk[0]: payload} if len(chunk) == 1 else payload
+            for symbol, entry in by_symbol.items():
+                if not isinstance(entry, dict):
+                    continue
+                # Credit exhaustion mid-batch shows up per symbol; raise so the router's cooldown engages.
+                _raise_if_throttled(entry)
+                if entry.get("status", "ok") == "ok":
+                    series[symbol.upper()] = entry.get("values") or []
+        return series
+
+    def _normalize_values(self, values: List[Dict[str, Any]]) -> np.ndarray:
+        rows = values[::-1]  # API returns newest first
+        return bars_from_columns(
+            open_=[row["open"] for row in rows],
+            high=[row["high"] for row in rows],
+            low=[row["low"] for row in rows],
+            close=[row["close"] for row in rows],
+            volume=[row.get("volume", 0.0) for row in rows],
+            timestamp=parse_timestamps([row["datetime"] for row in rows]),
+        )
+
+    def get_intraday_1m(self, symbol: str, limit: int = 60) -> np.ndarray:
+        """Fetch raw 1-minute bars."""
+
+        return self.get_aggregates(symbol, timespan="1min", limit=limit)
+
+
+def _raise_if_throttled(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # TwelveData reports credit exhaustion in-band with HTTP 200 and an error body.
+    if payload.get("code") == 429:
+        raise RateLimitError(payload.get("message") or "TwelveData rate limit (429)")
+    return payload
+
+
+def _interval(timespan: str) -> str:
+    return INTERVAL_MAP.get(timespan) or INTERVAL_MAP.get(timespan.lower(), "1day")
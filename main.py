@@ -1,94 +1,144 @@
+import asyncio
 import logging
+import random
+import signal
 import time
 from datetime import datetime, time as dt_time
-
-import pytz
+from zoneinfo import ZoneInfo
 
 from universe.universe_builder import get_universe
 from strategy.signal_router import route_signals
 from trader.allocation import allocate_positions
 from trader.order_executor import execute_trades, close_position, list_positions
 from trader import risk_model
+from core.pool import io_pool
 from data.price_router import PriceRouter
 from strategy.crash_detector import is_crash_mode
 
 logging.basicConfig(level=logging.INFO, format="%Y-%m-%d %H:%M:%S | %(levelname)s | %(name)s | %(message)s")
 logger = logging.getLogger(__name__)
 price_router = PriceRouter()
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+CYCLE_SECONDS = 300
+CYCLE_JITTER_SECONDS = 10
+MAX_BACKOFF_SECONDS = 1800
+# Aggregate windows read for every universe symbol each cycle (momentum, ML features).
+PRIME_WINDOWS = (60, 120)
 
 
 def market_open_now() -> bool:
-    est = pytz.timezone("America/New_York")
-    now = datetime.now(est).time()
-    market_open = dt_time(9, 30)
-    market_close = dt_time(16, 0)
-    return market_open <= now <= market_close
+    now = datetime.now(MARKET_TZ).time()
+    return MARKET_OPEN <= now <= MARKET_CLOSE
+
 
+def fetch_prices(symbols):
+    """Look up prices for ``symbols`` concurrently; symbols no provider can price are omitted."""
 
-def microcap_cycle():
-    while True:
-        start = time.time()
+    def _price(symbol):
         try:
-            if not market_open_now():
-                logger.info("Market closed — skipping cycle")
-                continue
-            crash, drop = is_crash_mode()
-            logger.info("Crash mode = %s (SPY 5min drop = %.3f)", crash, drop)
-            logger.info("=== Crash Mode %s ===", "ACTIVE" if crash else "OFF")
-
-            universe = get_universe()
-            if not universe:
-                logger.info("Universe empty; skipping cycle")
-                continue
-
-            signals = route_signals(universe, crash_mode=crash)
-            if not signals:
-                logger.info("No signals generated; skipping allocations")
-                continue
-            allocations = allocate_positions(signals, crash_mode=crash)
-
-            # Enforce max position caps before submitting
-            filtered_allocations = {}
-            open_positions = list_positions()
-            open_count = len(open_positions)
-            for symbol, shares in allocations.items():
-                try:
-                    price = price_router.get_price(symbol)
-                except Exception as exc:  # pragma: no cover - network guard
-                    logger.warning("Skipping %s for risk check; price unavailable: %s", symbol, exc)
-                    continue
-                notional = shares * price
-                if risk_model.can_open_position(open_count + len(filtered_allocations), notional, crash_mode=crash):
-                    filtered_allocations[symbol] = shares
-                else:
-                    logger.info("Risk cap blocked %s (notional %.2f)", symbol, notional)
-
-            execute_trades(filtered_allocations, crash_mode=crash)
-
-            # Exit checks for existing positions
-            for pos in list_positions():
-                try:
-                    current_price = float(pos.current_price)
-                    entry_price = float(pos.avg_entry_price)
-                except Exception:
-                    continue
-                position_payload = {
-                    "symbol": pos.symbol,
-                    "current_price": current_price,
-                    "entry_price": entry_price,
-                    "open_date": getattr(pos, "current_price_timestamp", None) or None,
-                }
-                if risk_model.should_exit(position_payload, crash_mode=crash):
-                    close_position(pos.symbol)
-
-            logger.info("=== Cycle Complete ===")
-        except Exception as exc:  # pragma: no cover - defensive loop
-            logger.exception("Cycle failed: %s", exc)
-        finally:
-            elapsed = time.time() - start
-            sleep_for = max(300 - elapsed, 0)
-            time.sleep(sleep_for)
+            return price_router.get_price(symbol)
+        except Exception as exc:  # pragma: no cover - network guard
+            logger.warning("Skipping %s for risk check; price unavailable: %s", symbol, exc)
+            return None
+
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    # One bulk quote request for whatever the cycle's primed snapshots no longer cover.
+    price_router.prime_prices(symbols)
+    prices = io_pool.map(_price, symbols)
+    return {symbol: price for symbol, price in zip(symbols, prices) if price is not None}
+
+
+def run_cycle() -> None:
+    """Run one scan → signal → allocate → execute → exit-check pass (blocking)."""
+
+    if not market_open_now():
+        logger.info("Market closed — skipping cycle")
+        return
+    # The SPY crash check and the universe build are independent network fetches; overlap them.
+    crash_future = io_pool.submit(is_crash_mode)
+    universe = get_universe()
+    crash, drop = crash_future.result()
+    logger.info("Crash mode = %s (SPY 5min drop = %.3f)", crash, drop)
+    logger.info("=== Crash Mode %s ===", "ACTIVE" if crash else "OFF")
+
+    if not universe:
+        logger.info("Universe empty; skipping cycle")
+        return
+    price_router.prime_cycle(universe, windows=PRIME_WINDOWS)
+
+    signals = route_signals(universe, crash_mode=crash)
+    if not signals:
+        logger.info("No signals generated; skipping allocations")
+        return
+    allocations = allocate_positions(signals, crash_mode=crash)
+
+    # Enforce max position caps before submitting
+    filtered_allocations = {}
+    # One broker round-trip per cycle (exit checks below reuse the snapshot); overlap it with the price lookups.
+    positions_future = io_pool.submit(list_positions)
+    prices = fetch_prices(allocations)
+    open_positions = positions_future.result()
+    open_count = len(open_positions)
+    for symbol, shares in allocations.items():
+        price = prices.get(symbol)
+        if price is None:
+            continue
+        notional = shares * price
+        if risk_model.can_open_position(open_count + len(filtered_allocations), notional, crash_mode=crash):
+            filtered_allocations[symbol] = shares
+        else:
+            logger.info("Risk cap blocked %s (notional %.2f)", symbol, notional)
+
+    execute_trades(filtered_allocations, crash_mode=crash)
+
+    # Exit checks for existing positions
+    for pos in open_positions:
+        try:
+            current_price = float(pos.current_price)
+            entry_price = float(pos.avg_entry_price)
+        except Exception:
+            continue
+        position_payload = {
+            "symbol": pos.symbol,
+            "current_price": current_price,
+            "entry_price": entry_price,
+            "open_date": getattr(pos, "current_price_timestamp", None) or None,
+        }
+        if risk_model.should_exit(position_payload, crash_mode=crash):
+            close_position(pos.symbol)
+
+    logger.info("Router cache (hits, misses): %s", PriceRouter.cache_stats())
+    logger.info("=== Cycle Complete ===")
+
+
+async def microcap_cycle() -> None:
+    # Deployments stop the container with SIGTERM: stop looping and release the shared I/O pool.
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    failures = 0
+    try:
+        while True:
+            start = time.monotonic()
+            try:
+                # The cycle body is blocking provider/broker I/O; keep it off the event loop.
+                await asyncio.to_thread(run_cycle)
+                failures = 0
+            except Exception as exc:  # pragma: no cover - defensive loop
+                failures += 1
+                logger.exception("Cycle failed: %s", exc)
+            # Back off exponentially on consecutive failures; jitter keeps restarts from aligning on providers.
+            interval = min(CYCLE_SECONDS * 2 ** max(failures - 1, 0), MAX_BACKOFF_SECONDS)
+            elapsed = time.monotonic() - start
+            await asyncio.sleep(max(interval - elapsed, 0) + random.uniform(0, CYCLE_JITTER_SECONDS))
+    except asyncio.CancelledError:
+        logger.info("Shutdown requested; stopping cycle loop")
+    finally:
+        # Queued fetches are dropped; an in-flight cycle fails fast on its cancelled futures.
+        io_pool.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":
-    microcap_cycle()
+    asyncio.run(microcap_cycle())
@@ -2,46 +2,27 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Dict, Optional
+from typing import Dict, Sequence
 
+from core.cache import TTLCache
 from core.config import get_settings
-from sentiment.gpt_provider import GPTProvider
+from sentiment.gpt_provider import GPTProvider, normalize_score
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
-def _normalize(score: float) -> float:
-    try:
-        val = float(score)
-    except (TypeError, ValueError):
-        return 0.0
-    return max(min(val, 1.0), -1.0)
-
-
 class SentimentEngine:
     def __init__(self) -> None:
         self.enabled = settings.use_sentiment
         self.cache_ttl = settings.sentiment_cache_ttl
         self.provider = GPTProvider()
-        self._cache: Dict[str, Dict] = {}
+        # Bounded and lock-protected: route_signals resolves sentiment from a thread pool.
+        self._cache = TTLCache(maxsize=2048, ttl=self.cache_ttl)
 
-    def _from_cache(self, symbol: str) -> Optional[Dict]:
-        entry = self._cache.get(symbol.upper())
-        if not entry:
-            return None
-        if time.time() - entry.get("timestamp", 0) > self.cache_ttl:
-            return None
-        return entry
-
-    def _set_cache(self, symbol: str, payload: Dict) -> None:
-        payload["timestamp"] = time.time()
-        self._cache[symbol.upper()] = payload
-
-    def _fetch_symbol(self, symbol: str) -> Dict:
-        symbol_u = symbol.upper()
+    def _fetch_symbol(self, symbol_u: str) -> Dict:
         res = self.provider.fetch_sentiment(symbol_u)
-        score = _normalize(res.get("sentiment_score", 0.0))
+        score = normalize_score(res.get("sentiment_score", 0.0))
         payload = {
             "symbol": symbol_u,
             "sentiment_score": score,
@@ -49,17 +30,50 @@ class SentimentEngine:
             "source": res.get("source", "gpt"),
         }
         logger.info("GPT sentiment for %s = %.4f", symbol_u, score)
-        self._set_cache(symbol_u, payload)
+        payload["timestamp"] = time.time()
+        self._cache[symbol_u] = payload
         return payload
 
     def get_sentiment(self, symbol: str) -> Dict:
+        symbol_u = symbol.upper()
         if not self.enabled:
-            return {"symbol": symbol.upper(), "sentiment_score": 0.0, "headlines": [], "source": "disabled"}
+            return {"symbol": symbol_u, "sentiment_score": 0.0, "headlines": [], "source": "disabled"}
 
-        cached = self._from_cache(symbol)
+        cached = self._cache.get(symbol_u)
         if cached:
             return cached
-        return self._fetch_symbol(symbol)
+        return self._fetch_symbol(symbol_u)
+
+    def get_sentiment_many(self, symbols: Sequence[str]) -> Dict[str, Dict]:
+        """Sentiment for many symbols; cache misses are scored together in batched GPT calls."""
+
+        symbols_u = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not self.enabled:
+            return {symbol_u: self.get_sentiment(symbol_u) for symbol_u in symbols_u}
+
+        results: Dict[str, Dict] = {}
+        missing = []
+        for symbol_u in symbols_u:
+            cached = self._cache.get(symbol_u)
+            if cached:
+                results[symbol_u] = cached
+            else:
+                missing.append(symbol_u)
+        if not missing:
+            return results
+        now = time.time()
+        for symbol_u, res in self.provider.fetch_sentiment_many(missing).items():
+            payload = {
+                "symbol": symbol_u,
+                "sentiment_score": res.get("sentiment_score", 0.0),
+                "headlines": res.get("headlines") or [],
+                "source": res.get("source", "gpt"),
+                "timestamp": now,
+            }
+            self._cache[symbol_u] = payload
+            results[symbol_u] = payload
+        logger.info("GPT batch sentiment scored %s symbols (%s cached)", len(missing), len(symbols_u) - len(missing))
+        return results
 
     def get_news(self, symbol: str) -> Dict:
         return self.get_sentiment(symbol)
@@ -70,3 +84,7 @@ _engine = SentimentEngine()
 
 def get_sentiment(symbol: str) -> Dict:
     return _engine.get_sentiment(symbol)
+
+
+def get_sentiment_many(symbols: Sequence[str]) -> Dict[str, Dict]:
+    return _engine.get_sentiment_many(symbols)
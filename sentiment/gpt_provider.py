@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Optional
+import re
+from typing import Dict, List, Optional, Sequence
 
 from core.config import get_settings
+from core.serialization import loads
 
 try:
     from openai import OpenAI
@@ -12,6 +14,9 @@ except Exception:  # pragma: no cover - dependency missing
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+# Tickers scored per chat completion in fetch_sentiment_many.
+BATCH_SYMBOLS = 25
 
 
 class GPTProvider:
@@ -59,36 +64,84 @@ class GPTProvider:
         except Exception as exc:  # pragma: no cover - network guard
             logger.warning("GPT sentiment failed for %s: %s", symbol_u, exc)
             score = 0.0
-        score = _normalize(score)
+        score = normalize_score(score)
         logger.info("GPT sentiment for %s = %.4f", symbol_u, score)
         return {"symbol": symbol_u, "sentiment_score": score, "source": "gpt"}
 
+    def fetch_sentiment_many(self, symbols: Sequence[str]) -> Dict[str, Dict]:
+        """
+        Score many tickers with one completion per ``BATCH_SYMBOLS`` chunk.
+        Returns the same payload as ``fetch_sentiment`` per symbol; tickers the model omits score 0.
+        """
+
+        pending = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        results: Dict[str, Dict] = {}
+        if not self._ensure_available():
+            return {symbol: {"symbol": symbol, "sentiment_score": 0.0, "source": "gpt"} for symbol in pending}
+
+        for start in range(0, len(pending), BATCH_SYMBOLS):
+            chunk = pending[start : start + BATCH_SYMBOLS]
+            prompt = (
+                "You are a trading assistant. For each stock ticker below, return a sentiment score between "
+                "-1 (very bearish) and 1 (very bullish) based on recent market tone. Respond with a JSON object "
+                'mapping each ticker to its number, e.g. {"AAPL": 0.2}. '
+                f"Tickers: {','.join(chunk)}"
+            )
+            try:
+                resp = self.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0,
+                    max_tokens=20 * len(chunk) + 20,
+                    response_format={"type": "json_object"},
+                )
+                content = resp.choices[0].message.content if resp and resp.choices else ""
+                scores = _extract_scores(content, chunk)
+            except Exception as exc:  # pragma: no cover - network guard
+                logger.warning("GPT batch sentiment failed for %s symbols: %s", len(chunk), exc)
+                scores = {}
+            for symbol in chunk:
+                results[symbol] = {"symbol": symbol, "sentiment_score": normalize_score(scores.get(symbol, 0.0)), "source": "gpt"}
+        return results
+
+
+def normalize_score(score: float) -> float:
+    """Coerce a model sentiment score to a float clamped to [-1, 1]; unparseable values score 0."""
 
-def _normalize(score: float) -> float:
     try:
         val = float(score)
     except (TypeError, ValueError):
         return 0.0
-    return max(min(val, 1.0), -1.0)
+    return -1.0 if val < -1.0 else (1.0 if val > 1.0 else val)
 
 
 def _extract_score(text: Optional[str]) -> float:
     if not text:
         return 0.0
-    import json
     try:
-        data = json.loads(text)
+        data = loads(text)
         if isinstance(data, dict) and "sentiment" in data:
             return float(data["sentiment"])
     except Exception:
         pass
     # fallback: find first number in text
-    import re
-
-    match = re.search(r"-?\d+(?:\.\d+)?", text)
+    match = NUMBER_PATTERN.search(text)
     if match:
         try:
             return float(match.group(0))
         except ValueError:
             return 0.0
     return 0.0
+
+
+def _extract_scores(text: Optional[str], symbols: List[str]) -> Dict[str, float]:
+    if not text:
+        return {}
+    try:
+        data = loads(text)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    wanted = set(symbols)
+    return {str(ticker).upper(): score for ticker, score in data.items() if str(ticker).upper() in wanted}
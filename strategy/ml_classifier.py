@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 import joblib
 import numpy as np
@@ -147,15 +147,22 @@ class MLClassifier:
         return model
 
     def predict(self, features: Dict[str, float], crash_mode: bool = False) -> float:
-        vector = np.array([[features.get(col, 0.0) for col in FEATURE_COLUMNS]])
+        return float(self.predict_many([features], crash_mode=crash_mode)[0])
+
+    def predict_many(self, feature_rows: Sequence[Dict[str, float]], crash_mode: bool = False) -> np.ndarray:
+        """Probabilities for many feature dicts with a single ``predict_proba`` call."""
+
+        if not feature_rows:
+            return np.empty(0)
+        matrix = np.array([[features.get(col, 0.0) for col in FEATURE_COLUMNS] for features in feature_rows], dtype=float)
         if crash_mode:
             # weight ATR-band and MACD-hist higher during crash
             macd_idx = FEATURE_COLUMNS.index("macd_hist")
             atr_band_idx = FEATURE_COLUMNS.index("atr_band_position")
-            vector[0, macd_idx] *= 1.3
-            vector[0, atr_band_idx] *= 1.3
-        proba = self.model.predict_proba(vector)[0][1]
-        return float(np.clip(proba, 0.0, 1.0))
+            matrix[:, macd_idx] *= 1.3
+            matrix[:, atr_band_idx] *= 1.3
+        proba = self.model.predict_proba(matrix)[:, 1]
+        return np.clip(proba, 0.0, 1.0)
 
 
 def build_features(price_frame: pd.DataFrame) -> Dict[str, float]:
@@ -214,7 +221,8 @@ def get_classifier() -> MLClassifier:
 
 
 def generate_predictions(universe: Iterable[str], crash_mode: bool = False) -> List[Tuple[str, float, Dict[str, float]]]:
-    predictions: List[Tuple[str, float, Dict[str, float]]] = []
+    symbols: List[str] = []
+    feature_rows: List[Dict[str, float]] = []
     classifier = get_classifier()
     for symbol in universe:
         try:
@@ -230,7 +238,13 @@ def generate_predictions(universe: Iterable[str], crash_mode: bool = False) -> L
         features = build_features(price_frame)
         if crash_mode:
             features = {k: (0.0 if v is None or not np.isfinite(v) else v) for k, v in features.items()}
-        prob = classifier.predict(features, crash_mode=crash_mode)
+        symbols.append(symbol)
+        feature_rows.append(features)
+
+    # Score the whole universe in one model call; per-row predict_proba overhead dominates small inputs.
+    probs = classifier.predict_many(feature_rows, crash_mode=crash_mode)
+    predictions: List[Tuple[str, float, Dict[str, float]]] = []
+    for symbol, prob, features in zip(symbols, probs.tolist(), feature_rows):
         predictions.append((symbol, prob, features))
         logger.info("ML probability for %s → %.3f", symbol, prob)
     return predictions
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import List, Optional, Sequence, Tuple
 
-import pandas as pd
+import numpy as np
 
 from data.price_router import PriceRouter
 from core.logger import get_logger
@@ -11,46 +11,61 @@ logger = get_logger(__name__)
 router = PriceRouter()
 
 MOMENTUM_TOP_K = 10
+MIN_BARS = 12
+VOLUME_BASE_BARS = 18
 
 
 def compute_momentum_scores(
     symbols: Sequence[str], top_k: Optional[int] = MOMENTUM_TOP_K, *, crash_mode: bool = False
 ) -> List[Tuple[str, float]]:
-    scores: List[Tuple[str, float]] = []
+    eligible: List[str] = []
+    closes: List[np.ndarray] = []
+    volumes = np.full((len(symbols), VOLUME_BASE_BARS), np.nan, dtype=np.float32)
     for symbol in symbols:
         try:
             bars = router.get_aggregates(symbol, window=60)
         except Exception as exc:  # pragma: no cover - network guard
             logger.warning("Aggregates unavailable for %s: %s", symbol, exc)
             continue
-        df = PriceRouter.aggregates_to_dataframe(bars)
-        if df.empty or len(df) < 12:
+        if len(bars) < MIN_BARS:
             continue
-        close = df["close"].astype(float)
-        volume = df["volume"].astype(float)
-
-        # 5-min bars: short-term velocity, slope, and volume expansion
-        ret_short = (close.iloc[-1] / close.iloc[-3]) - 1 if len(close) >= 3 else 0.0
-        ret_mid = (close.iloc[-1] / close.iloc[-12]) - 1 if len(close) >= 12 else 0.0
-        slope = close.diff().rolling(6).mean().iloc[-1] if len(close) >= 6 else 0.0
-        recent_vol = volume.tail(6).mean()
-        base_vol = volume.tail(18).mean()
-        vol_ratio = (recent_vol / base_vol) if pd.notna(base_vol) and base_vol else 0.0
-
-        if crash_mode:
-            # allow negative short-term drifts; emphasize slope during crash
-            score = ret_short * 0.3 + ret_mid * 0.3 + slope * 0.4
-        else:
-            score = ret_short * 0.5 + ret_mid * 0.3 + slope * 0.2
-        scores.append((symbol, score))
+        arrays = PriceRouter.aggregates_to_arrays(bars)
+        closes.append(arrays["close"][-MIN_BARS:])
+        # Right-align volumes; shorter histories leave leading NaNs that nanmean skips.
+        tail = arrays["volume"][-VOLUME_BASE_BARS:]
+        volumes[len(eligible), VOLUME_BASE_BARS - len(tail) :] = tail
+        eligible.append(symbol)
+    if not eligible:
+        return []
+
+    # 5-min bars: short-term velocity, slope, and volume expansion — one vector op per feature
+    close = np.stack(closes)
+    volume = volumes[: len(eligible)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret_short = close[:, -1] / close[:, -3] - 1
+        ret_mid = close[:, -1] / close[:, -MIN_BARS] - 1
+        slope = np.diff(close[:, -7:], axis=1).mean(axis=1)
+        recent_vol = volume[:, -6:].mean(axis=1)
+        base_vol = np.nanmean(volume, axis=1)
+        vol_ratio = np.where(base_vol > 0, recent_vol / base_vol, 0.0)
+
+    if crash_mode:
+        # allow negative short-term drifts; emphasize slope during crash
+        score = ret_short * 0.3 + ret_mid * 0.3 + slope * 0.4
+    else:
+        score = ret_short * 0.5 + ret_mid * 0.3 + slope * 0.2
+
+    scores: List[Tuple[str, float]] = []
+    for index, symbol in enumerate(eligible):
+        scores.append((symbol, float(score[index])))
         logger.info(
             "Momentum %s → score=%.3f short=%.3f mid=%.3f slope=%.4f vol_ratio=%.2f",
             symbol,
-            score,
-            ret_short,
-            ret_mid,
-            slope,
-            vol_ratio,
+            score[index],
+            ret_short[index],
+            ret_mid[index],
+            slope[index],
+            vol_ratio[index],
         )
 
     scores = sorted(scores, key=lambda x: x[1], reverse=True)
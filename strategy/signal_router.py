@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Dict, List
+from concurrent.futures import as_completed
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
 
 from core.config import get_settings
+from core.pool import io_pool
 from data.price_router import PriceRouter
-from sentiment.engine import get_sentiment
+from sentiment.engine import get_sentiment, get_sentiment_many
 from strategy.momentum import compute_momentum_scores
 from strategy.technicals import passes_entry_filter, compute_atr
 from strategy.ml_classifier import generate_predictions
@@ -16,33 +21,74 @@ logger = logging.getLogger(__name__)
 price_router = PriceRouter()
 settings = get_settings()
 
+AGGREGATE_WINDOW = 120
+BAR_SECONDS = 300
+
+
+def _prefetch(
+    symbols: Iterable[str], window: int, with_sentiment: bool
+) -> Tuple[Dict[str, np.ndarray | Exception], Dict[str, Dict[str, Any] | Exception]]:
+    """
+    Fetch aggregates (and sentiment, when enabled) for every symbol on one shared pool.
+    Sentiment is scored in batched GPT calls alongside the per-symbol bar fetches.
+    Failures are returned in place of results so the caller decides how to handle them.
+    """
+
+    aggregates: Dict[str, np.ndarray | Exception] = {}
+    sentiments: Dict[str, Dict[str, Any] | Exception] = {}
+    symbols = list(symbols)
+    sentiment_future = io_pool.submit(get_sentiment_many, symbols) if with_sentiment and symbols else None
+    futures = {io_pool.submit(price_router.get_aggregates, symbol, window=window): symbol for symbol in symbols}
+    for future in as_completed(futures):
+        symbol = futures[future]
+        try:
+            aggregates[symbol] = future.result()
+        except Exception as exc:  # pragma: no cover - network guard
+            aggregates[symbol] = exc
+    if sentiment_future is not None:
+        try:
+            sentiments.update(sentiment_future.result())
+        except Exception as exc:  # pragma: no cover - network guard
+            sentiments.update(dict.fromkeys(symbols, exc))
+    return aggregates, sentiments
+
 
 def route_signals(universe: List[str], crash_mode: bool = False) -> List[Dict[str, float | str]]:
     momentum = compute_momentum_scores(universe, top_k=0, crash_mode=crash_mode)
     momentum_map = {sym: score for sym, score in momentum}
+    momentum_rank = {sym: index for index, sym in enumerate(momentum_map)}
 
     ml_preds = generate_predictions(universe, crash_mode=crash_mode)
     signals: List[Dict[str, float | str]] = []
     max_rank = max(len(momentum_map), 1)
     rate_limited: set[str] = set()
+    ml_threshold_trend = 0.22
+    ml_threshold_reversal = 0.28
+    # Network-bound bar and sentiment fetches run up front in parallel; the loop below only does CPU work.
+    prefetched, prefetched_sentiment = _prefetch(
+        dict.fromkeys(symbol for symbol, prob, _ in ml_preds if prob >= ml_threshold_trend),
+        AGGREGATE_WINDOW,
+        with_sentiment=settings.use_sentiment,
+    )
 
     for symbol, prob, features in ml_preds:
         if symbol in rate_limited:
             continue
-        time.sleep(0.01)  # stagger provider requests slightly for large universes
-        rank_component = 1.0 - (list(momentum_map.keys()).index(symbol) / max_rank) if symbol in momentum_map else 0.0
-        ml_threshold_trend = 0.22
-        ml_threshold_reversal = 0.28
+        rank_component = 1.0 - (momentum_rank[symbol] / max_rank) if symbol in momentum_rank else 0.0
         if prob < ml_threshold_trend:
             continue
         sentiment = 0.0
         if settings.use_sentiment:
-            sentiment_payload = get_sentiment(symbol)
+            sentiment_payload = prefetched_sentiment.get(symbol)
+            if not isinstance(sentiment_payload, dict):
+                sentiment_payload = get_sentiment(symbol)
             sentiment_raw = float(sentiment_payload.get("sentiment_score", 0.0) or 0.0)
             sentiment = (sentiment_raw + 1.0) / 2.0  # map [-1,1] to [0,1]
 
         try:
-            bars = price_router.get_aggregates(symbol, window=120)
+            bars = prefetched[symbol]
+            if isinstance(bars, Exception):
+                raise bars
             df = PriceRouter.aggregates_to_dataframe(bars)
         except Exception as exc:  # pragma: no cover - network guard
             msg = str(exc).lower()
@@ -76,6 +122,16 @@ def route_signals(universe: List[str], crash_mode: bool = False) -> List[Dict[st
 
         # slope confirmations
         close = df["close"].astype(float)
+        # Last close (stamped with the end of the raw bar it came from) travels with the signal so
+        # allocation can skip a quote round-trip while it is fresh. The last 5-minute bucket is usually
+        # partial, so its end is only a fallback, and a stamp is never allowed to lie in the future.
+        quoted_at = price_router.last_bar_end(symbol)
+        if quoted_at is None:
+            quoted_at = pd.Timestamp(df["timestamp"].iloc[-1]).timestamp() + BAR_SECONDS
+        quote = {
+            "price": float(close.iloc[-1]),
+            "price_time": min(quoted_at, time.time()),
+        }
         short_slope = float(close.pct_change().tail(3).mean() or 0.0)
         mid_slope = float(close.pct_change().tail(12).mean() or 0.0)
 
@@ -116,6 +172,7 @@ def route_signals(universe: List[str], crash_mode: bool = False) -> List[Dict[st
                     "vol_ratio": vol_ratio,
                     "momentum_score": momentum_score,
                     "reason": "crash expansion" if crash_mode else "trend",
+                    **quote,
                 }
             )
         elif dip_buy_ok:
@@ -137,6 +194,7 @@ def route_signals(universe: List[str], crash_mode: bool = False) -> List[Dict[st
                     "vol_ratio": vol_ratio,
                     "momentum_score": momentum_score,
                     "reason": "dip buy",
+                    **quote,
                 }
             )
         elif reversal_allowed:
@@ -160,6 +218,7 @@ def route_signals(universe: List[str], crash_mode: bool = False) -> List[Dict[st
                     "vol_ratio": vol_ratio,
                     "momentum_score": momentum_score,
                     "reason": "reversal",
+                    **quote,
                 }
             )
         if crash_mode and len(signals) >= 3:
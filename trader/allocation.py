@@ -1,12 +1,18 @@
 import logging
-import math
-import os
+import time
 
+from core.config import get_settings
 from data.price_router import PriceRouter
 
 logger = logging.getLogger(__name__)
 price_router = PriceRouter()
-DAILY_BUDGET = float(os.getenv("DAILY_BUDGET_USD", 10000))
+DAILY_BUDGET = get_settings().daily_budget
+CRASH_MAX_POSITIONS = 3
+# Per-position budgets are fixed for the process; compute them once instead of per call.
+CRASH_BUDGET = DAILY_BUDGET * 0.80
+CRASH_BASE_ALLOCATION = CRASH_BUDGET / CRASH_MAX_POSITIONS
+BASE_ALLOCATION = DAILY_BUDGET / 3
+PRICE_STALENESS_SECONDS = get_settings().price_staleness_seconds
 
 
 def allocate_positions(final_signals, crash_mode: bool = False):
@@ -15,24 +21,34 @@ def allocate_positions(final_signals, crash_mode: bool = False):
         return {}
 
     if crash_mode:
-        max_positions = 3
-        budget_remaining = DAILY_BUDGET * 0.80
-        base_allocation = budget_remaining / max_positions
+        budget_remaining = CRASH_BUDGET
+        base_allocation = CRASH_BASE_ALLOCATION
     else:
         budget_remaining = DAILY_BUDGET
-        base_allocation = DAILY_BUDGET / 3
+        base_allocation = BASE_ALLOCATION
 
     allocations = {}
+    get_price = price_router.get_price
+    now = time.time()
     for signal in final_signals:
-        if crash_mode and len(allocations) >= 3:
+        if crash_mode and len(allocations) >= CRASH_MAX_POSITIONS:
             logger.info("Crash mode: max positions reached")
             break
-        symbol = signal["symbol"] if isinstance(signal, dict) else signal
-        signal_type = signal.get("type") if isinstance(signal, dict) else "momentum"
-        vol_ratio = float(signal.get("vol_ratio", 1.0) if isinstance(signal, dict) else 1.0)
+        if isinstance(signal, dict):
+            symbol = signal["symbol"]
+            signal_type = signal.get("type")
+            vol_ratio = float(signal.get("vol_ratio", 1.0))
+            quoted_price = signal.get("price")
+            quoted_at = signal.get("price_time")
+        else:
+            symbol, signal_type, vol_ratio = signal, "momentum", 1.0
+            quoted_price = quoted_at = None
 
         try:
-            price = price_router.get_price(symbol)
+            if quoted_price and quoted_at and now - quoted_at <= PRICE_STALENESS_SECONDS:
+                price = float(quoted_price)
+            else:
+                price = get_price(symbol)
         except Exception as exc:  # pragma: no cover - network guard
             logger.warning("Price unavailable for %s: %s", symbol, exc)
             continue
@@ -54,7 +70,7 @@ def allocate_positions(final_signals, crash_mode: bool = False):
                 size *= 0.6
 
         size = min(size, budget_remaining)
-        shares = math.floor(size / price) if price > 0 else 0
+        shares = int(size // price) if price > 0 else 0
         if shares <= 0:
             logger.info("Capital %.2f insufficient for %s (price %.2f)", size, symbol, price)
             continue
@@ -6,6 +6,7 @@ from alpaca.trading.enums import OrderClass, OrderSide, TimeInForce
 from alpaca.trading.requests import MarketOrderRequest, StopLossRequest, TakeProfitRequest
 
 from core.config import get_settings
+from core.pool import io_pool
 from data.price_router import PriceRouter
 from trader.risk_model import stop_loss_price, take_profit_price
 
@@ -32,6 +33,8 @@ def execute_trades(allocations, crash_mode: bool = False):
         logger.warning("Trading client unavailable; cannot execute trades. Check Alpaca API keys.")
         return
 
+    # Positions and account are independent broker calls; overlap the two round-trips.
+    account_future = io_pool.submit(trading_client.get_account)
     try:
         open_positions = {pos.symbol: pos for pos in trading_client.get_all_positions()}
     except Exception as exc:  # pragma: no cover - network guard
@@ -39,11 +42,12 @@ def execute_trades(allocations, crash_mode: bool = False):
         open_positions = {}
 
     try:
-        buying_power = float(trading_client.get_account().buying_power)
+        buying_power = float(account_future.result().buying_power)
     except Exception as exc:  # pragma: no cover - network guard
         logger.warning("Unable to fetch buying power: %s", exc)
         buying_power = None
 
+    price_router.prime_prices([symbol for symbol, shares in allocations.items() if shares > 0])
     for symbol, shares in allocations.items():
         if shares <= 0:
             continue
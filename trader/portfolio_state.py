@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
 from core.config import Settings
 from core.logger import get_logger
+from core.serialization import dumps, loads
 
 logger = get_logger(__name__)
 
@@ -23,9 +23,8 @@ def load_state(path: Path, settings: Settings) -> Dict[str, Any]:
     if not path.exists():
         return reset_state(path, settings, warn=True)
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            state = json.load(handle)
-    except (OSError, json.JSONDecodeError) as exc:
+        state = loads(path.read_bytes())
+    except (OSError, ValueError) as exc:
         logger.warning("Portfolio state unreadable — resetting.")
         state = reset_state(path, settings, warn=False)
         return state
@@ -45,8 +44,10 @@ def load_state(path: Path, settings: Settings) -> Dict[str, Any]:
 
 def save_state(path: Path, state: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(state, handle, indent=2)
+    # Write a sibling temp file and rename over the target so a crash mid-write never leaves a torn state file.
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(dumps(state, indent=True))
+    tmp_path.replace(path)
 
 
 def ensure_today_state(state: Dict[str, Any], settings: Settings) -> None:
@@ -61,7 +62,7 @@ def ensure_today_state(state: Dict[str, Any], settings: Settings) -> None:
 def reset_state(path: Path, settings: Settings, warn: bool = False) -> Dict[str, Any]:
     if warn:
         logger.warning("Portfolio state unreadable — resetting.")
-    state = {"positions": {}, "last_updated": datetime.utcnow().isoformat()}
+    state = {"positions": {}, "last_updated": datetime.now(timezone.utc).isoformat()}
     save_state(path, state)
     return state
 
@@ -4,15 +4,18 @@ import logging
 import os
 from datetime import datetime, timezone
 
+from core.config import get_settings
 from strategy.technicals import passes_exit_filter
 from data.price_router import PriceRouter
 
 STOP_LOSS_PCT = 0.006
 TAKE_PROFIT_PCT = 0.018
-DAILY_BUDGET = float(os.getenv("DAILY_BUDGET_USD", 10000))
-MAX_POSITIONS = int(os.getenv("MAX_POSITIONS", "5"))
+DAILY_BUDGET = get_settings().daily_budget
+MAX_POSITIONS = get_settings().max_positions
 # Allow explicit override; otherwise default to one-third of daily budget
 MAX_POSITION_SIZE = float(os.getenv("MAX_POSITION_SIZE", DAILY_BUDGET / 3))
+CRASH_MAX_POSITIONS = 3
+CRASH_MAX_POSITION_SIZE = DAILY_BUDGET * 0.80 / CRASH_MAX_POSITIONS
 price_router = PriceRouter()
 logger = logging.getLogger(__name__)
 
@@ -28,8 +31,8 @@ def take_profit_price(entry_price: float, crash_mode: bool = False) -> float:
 
 
 def can_open_position(current_positions: int, allocation_amount: float, crash_mode: bool = False) -> bool:
-    max_positions = 3 if crash_mode else MAX_POSITIONS
-    max_pos_size = (DAILY_BUDGET * 0.80 / max_positions) if crash_mode else MAX_POSITION_SIZE
+    max_positions = CRASH_MAX_POSITIONS if crash_mode else MAX_POSITIONS
+    max_pos_size = CRASH_MAX_POSITION_SIZE if crash_mode else MAX_POSITION_SIZE
     return current_positions < max_positions and allocation_amount <= max_pos_size
 
 
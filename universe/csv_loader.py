@@ -15,7 +15,8 @@ def load_universe_from_csv(path: Path) -> pd.DataFrame:
         logger.warning("Universe CSV missing: %s", path)
         return pd.DataFrame(columns=["symbol"])
     try:
-        df = pd.read_csv(path)
+        # Only the symbol column is used; skip parsing/type-inferring anything else in the file.
+        df = pd.read_csv(path, usecols=lambda column: column == "symbol", dtype=str)
     except Exception as exc:
         logger.warning("Unable to read universe CSV %s: %s", path, exc)
         return pd.DataFrame(columns=["symbol"])
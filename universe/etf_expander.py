@@ -1,41 +1,67 @@
 from __future__ import annotations
 
-from typing import Sequence, Set
+from typing import List, Optional, Sequence, Set
 
 import requests
 
 from core.config import get_settings
+from core.http import build_session
 from core.logger import get_logger
+from core.pool import io_pool
+from core.serialization import loads
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 ALPACA_ETF_ENDPOINT = "reference/etfs/{symbol}/holdings"
+ETF_HOLDINGS_URL = f"{settings.alpaca_data_url.rstrip('/')}/{ALPACA_ETF_ENDPOINT}"
+
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    # Built lazily and kept for the life of the process so each universe rebuild reuses warm connections.
+    global _session
+    if _session is None:
+        _session = build_session(
+            {
+                "APCA-API-KEY-ID": settings.alpaca_api_key,
+                "APCA-API-SECRET-KEY": settings.alpaca_api_secret,
+            }
+        )
+    return _session
 
 
 def fetch_etf_holdings(etfs: Sequence[str]) -> Set[str]:
     """Try to fetch ETF holdings from Alpaca data API; return empty set on 404/unauthorized."""
 
     holdings: Set[str] = set()
-    headers = {
-        "APCA-API-KEY-ID": settings.alpaca_api_key,
-        "APCA-API-SECRET-KEY": settings.alpaca_api_secret,
-    }
-    for etf in etfs:
-        url = f"{settings.alpaca_data_url.rstrip('/')}/{ALPACA_ETF_ENDPOINT.format(symbol=etf.upper())}"
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 404:
-                logger.info("Alpaca ETF holdings not available for %s", etf)
-                continue
-            response.raise_for_status()
-        except requests.RequestException as exc:  # pragma: no cover - network guard
-            logger.warning("Failed to fetch holdings for %s: %s", etf, exc)
-            continue
-
-        data = response.json().get("holdings") or response.json().get("results") or []
-        for item in data:
-            symbol = item.get("symbol") or item.get("ticker")
-            if symbol:
-                holdings.add(str(symbol).upper())
+    if not etfs:
+        return holdings
+    # One pooled session shared by all workers; each ETF's request overlaps the others' round-trips.
+    session = _get_session()
+    for symbols in io_pool.map(lambda etf: _fetch_one(session, etf), etfs):
+        holdings.update(symbols)
     return holdings
+
+
+def _fetch_one(session: requests.Session, etf: str) -> List[str]:
+    url = ETF_HOLDINGS_URL.format(symbol=etf.upper())
+    try:
+        response = session.get(url, timeout=10)
+        if response.status_code == 404:
+            logger.info("Alpaca ETF holdings not available for %s", etf)
+            return []
+        response.raise_for_status()
+        payload = loads(response.content)
+    except (requests.RequestException, ValueError) as exc:  # pragma: no cover - network guard
+        logger.warning("Failed to fetch holdings for %s: %s", etf, exc)
+        return []
+
+    data = payload.get("holdings") or payload.get("results") or []
+    symbols: List[str] = []
+    for item in data:
+        symbol = item.get("symbol") or item.get("ticker")
+        if symbol:
+            symbols.append(str(symbol).upper())
+    return symbols
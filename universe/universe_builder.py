@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 
+from core.cache import TTLCache
 from core.config import get_settings
 from core.logger import get_logger
 from universe.csv_loader import load_universe_from_csv
@@ -11,27 +12,37 @@ logger = get_logger(__name__)
 settings = get_settings()
 
 DEFAULT_ETFS = ["SPY", "QQQ", "IWM"]
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9\.\-]+$")
+# ETF constituents change at most daily; reuse a holdings-derived universe across cycles.
+UNIVERSE_CACHE_TTL = 3600
+_universe_cache = TTLCache(maxsize=1, ttl=UNIVERSE_CACHE_TTL)
 
 
 def _filter_symbols(symbols: list[str]) -> list[str]:
-    pattern = re.compile(r"^[A-Z0-9\.\-]+$")
-    return [sym for sym in symbols if isinstance(sym, str) and pattern.match(sym.upper())]
+    return [sym for sym in symbols if isinstance(sym, str) and SYMBOL_PATTERN.match(sym.upper())]
 
 
 def _csv_universe(path) -> list[str]:
-    df = load_universe_from_csv(path)
-    return _filter_symbols(df["symbol"].dropna().astype(str).str.upper().tolist())
+    # The loader already upper-cases; filter the column in one vectorized pass instead of per row.
+    symbols = load_universe_from_csv(path)["symbol"].dropna().astype(str)
+    return list(dict.fromkeys(symbols[symbols.str.match(SYMBOL_PATTERN)]))
 
 
 def get_universe() -> list[str]:
     """Return a broad liquid universe from ETF constituents or CSV fallback."""
 
+    cached = _universe_cache.get("etf")
+    if cached is not None:
+        logger.info("Universe size (cached ETF holdings): %s", len(cached))
+        return list(cached)
     etf_candidates = settings.microcap_etfs or DEFAULT_ETFS
     holdings = fetch_etf_holdings(etf_candidates)
     symbols: list[str] = []
     if holdings:
         symbols = _filter_symbols(sorted(set(holdings)))
         logger.info("Loaded %s symbols via ETF holdings", len(symbols))
+        # Fallback universes are not cached so the next cycle retries the holdings fetch.
+        _universe_cache["etf"] = tuple(symbols)
     else:
         symbols = _csv_universe(settings.universe_fallback_csv)
         if symbols: